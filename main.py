@@ -1,67 +1,220 @@
 import uvicorn
 import httpx
-import contextvars
+import asyncio
+import hashlib
+import time
+import functools
+import orjson
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from mcp.server import Server
 from mcp.server.sse import SseServerTransport
-from pydantic import BaseModel, Field
-from typing import List, Optional, Literal, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional, Dict, Any, Tuple, Callable, Awaitable, Union
 import mcp.types as types
-from settings import DJANGO_BASE_URL, PORT, DJANGO_AUTH_TOKEN
+from settings import DJANGO_BASE_URL_NORMALIZED, PORT, DJANGO_AUTH_TOKEN, WEB_CONCURRENCY
 from oauth import router as auth_router
+from schemas import GET_TASKS_SCHEMA, CREATE_TASK_SCHEMA, EMPTY_SCHEMA
 import dateutil.parser
-
-# --- State Management ---
-current_user_token: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("current_user_token", default=None)
+from enum import Enum
 
 # --- Helpers ---
-async def fetch_from_django(endpoint: str, method: str = "GET", params: dict = None, body: dict = None) -> Dict[str, Any]:
-    token = current_user_token.get() or DJANGO_AUTH_TOKEN
+_METHOD_SET = {"GET", "POST", "PATCH", "PUT", "DELETE"}
+
+# Identical GETs already on the wire; later callers await the first caller's future
+_inflight: Dict[tuple, asyncio.Future] = {}
+
+def request_key(endpoint: str, params: Union[dict, httpx.QueryParams], token: str) -> tuple:
+    token_hash = hashlib.blake2b(token.encode(), digest_size=8).digest()
+    return (endpoint, tuple(sorted((params or {}).items())), token_hash)
+
+@functools.lru_cache(maxsize=512)
+def _auth_headers(token: str) -> Dict[str, str]:
+    # Shared across calls for the same token -- never mutate the returned dict
+    return {"Authorization": f"Bearer {token}"}
+
+async def _send_to_django(method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+    try:
+        resp = await app.state.http.request(method, endpoint.lstrip('/'), **kwargs)
+    except httpx.RequestError as e:  # transport, timeout, decoding and redirect errors
+        return {"error": str(e)}
+
+    if resp.status_code == 204: return {"success": True}
+    # Plain status check: Django 4xx are routine and shouldn't pay for raising HTTPStatusError
+    if not resp.is_success:
+        return {"error": resp.text[:500], "status_code": resp.status_code}
+    try:
+        return orjson.loads(resp.content)
+    except orjson.JSONDecodeError as e:
+        return {"error": f"Invalid JSON from backend: {e}"}
+
+async def fetch_from_django(token: Optional[str], endpoint: str, method: str = "GET", params: Union[dict, httpx.QueryParams] = None, body: dict = None) -> Dict[str, Any]:
+    token = token or DJANGO_AUTH_TOKEN
     
     if not token:
         return {"error": "Authentication required."}
 
-    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-    url = f"{DJANGO_BASE_URL.rstrip('/')}/{endpoint.lstrip('/')}"
-    
-    async with httpx.AsyncClient() as client:
+    method = method.upper()
+    if method not in _METHOD_SET:
+        return {"error": f"Unsupported method: {method}"}
+
+    headers = _auth_headers(token)
+    if method != "GET":
+        return await _send_to_django(method, endpoint, headers=headers, json=body)
+
+    key = request_key(endpoint, params, token)
+    pending = _inflight.get(key)
+    while pending is not None:
         try:
-            # Updated to support PATCH and PUT dynamically
-            if method.upper() == "GET":
-                resp = await client.get(url, headers=headers, params=params, timeout=10.0)
-            elif method.upper() == "POST":
-                resp = await client.post(url, headers=headers, json=body, timeout=10.0)
-            elif method.upper() == "PATCH":
-                resp = await client.patch(url, headers=headers, json=body, timeout=10.0)
-            elif method.upper() == "PUT":
-                resp = await client.put(url, headers=headers, json=body, timeout=10.0)
-            
-            if resp.status_code == 204: return {"success": True}
-            resp.raise_for_status()
-            return resp.json()
+            return await asyncio.shield(pending)
         except Exception as e:
-            return {"error": str(e)}
+            # Raise a fresh exception per follower so tasks don't share (and grow) one traceback
+            raise RuntimeError(f"Shared Django request for {endpoint} failed: {e!r}") from e
+        except asyncio.CancelledError:
+            if not pending.cancelled() or asyncio.current_task().cancelling():
+                raise  # this caller was cancelled itself, possibly alongside the leader
+            # The leader's caller went away; retry, possibly as the new leader
+            pending = _inflight.get(key)
+
+    fut = asyncio.get_running_loop().create_future()
+    _inflight[key] = fut
+    try:
+        result = await _send_to_django(method, endpoint, headers=headers, params=params)
+    except asyncio.CancelledError:
+        fut.cancel()
+        raise
+    except Exception as e:
+        fut.set_exception(e)
+        fut.exception()  # mark retrieved so a follower-less failure isn't logged as unobserved
+        raise
+    else:
+        fut.set_result(result)
+        return result
+    finally:
+        if _inflight.get(key) is fut:
+            del _inflight[key]
+
+# --- Response Cache ---
+# Short-lived cache for read-only Django endpoints, keyed per user so tokens never share entries.
+_CACHE_MAXSIZE = 1024
+_cache: Dict[tuple, Tuple[float, Any]] = {}
+# key -> [lock, number of callers holding or waiting on it]; dropped when the count reaches 0
+_cache_locks: Dict[tuple, list] = {}
+# Bumped by every invalidation so fills that started before a write don't store stale data
+_cache_generation = 0
+
+def cache_key(token: Optional[str], endpoint: str, params: dict = None) -> tuple:
+    return request_key(endpoint, params, token or DJANGO_AUTH_TOKEN or "")
+
+def _cache_store(key: tuple, expires: float, value: Any):
+    _cache.pop(key, None)
+    if len(_cache) >= _CACHE_MAXSIZE:
+        now = time.monotonic()
+        for k in [k for k, (exp, _) in _cache.items() if exp <= now]:
+            del _cache[k]
+        # Still full: evict in insertion order (oldest first)
+        while len(_cache) >= _CACHE_MAXSIZE:
+            del _cache[next(iter(_cache))]
+    _cache[key] = (expires, value)
+
+async def cached_fetch(key: tuple, ttl: float, coro_factory: Callable[[], Awaitable[Any]]) -> Any:
+    entry = _cache.get(key)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+
+    # Single-flight: concurrent misses for the same key wait for one Django call
+    slot = _cache_locks.get(key)
+    if slot is None:
+        slot = _cache_locks[key] = [asyncio.Lock(), 0]
+    slot[1] += 1
+    try:
+        async with slot[0]:
+            entry = _cache.get(key)
+            if entry and entry[0] > time.monotonic():
+                return entry[1]
+            generation = _cache_generation
+            result = await coro_factory()
+            if generation == _cache_generation and not (isinstance(result, dict) and "error" in result):
+                _cache_store(key, time.monotonic() + ttl, result)
+            return result
+    finally:
+        slot[1] -= 1
+        if not slot[1]:
+            del _cache_locks[key]
+
+def invalidate_cache(prefix: str):
+    global _cache_generation
+    _cache_generation += 1
+    for key in [k for k in _cache if k[0].startswith(prefix)]:
+        _cache.pop(key, None)
 
 # --- App Setup ---
-app = FastAPI(title="Django MCP Bridge")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled HTTP/2 client for the whole process; concurrent Django calls multiplex over few connections
+    app.state.http = httpx.AsyncClient(
+        base_url=DJANGO_BASE_URL_NORMALIZED,
+        timeout=10.0,
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=10, max_connections=50),
+        headers={"Content-Type": "application/json"},
+    )
+    yield
+    await app.state.http.aclose()
+
+app = FastAPI(title="Django MCP Bridge", lifespan=lifespan)
 app.include_router(auth_router, prefix="/oauth")
 
 # --- Auth Middleware ---
-@app.middleware("http")
-async def auth_middleware(request: Request, call_next):
-    auth = request.headers.get("Authorization", "")
-    token_var = None
-    if auth.startswith("Bearer "):
-        token_var = current_user_token.set(auth.split(" ")[1])
-    try:
-        return await call_next(request)
-    finally:
-        if token_var: current_user_token.reset(token_var)
+class AuthMiddleware:
+    """Pure ASGI middleware that stores the caller's Bearer token on the request state."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        token = None
+        for key, value in scope["headers"]:
+            if key == b"authorization":
+                # Auth scheme names are case-insensitive (RFC 7235)
+                if value[:7].lower() == b"bearer ":
+                    token = value[7:].decode("latin-1")
+                break
+        # Exposed to handlers as request.state.token
+        scope.setdefault("state", {})["token"] = token
+        await self.app(scope, receive, send)
+
+app.add_middleware(AuthMiddleware)
 
 # --- MCP Server Setup ---
 mcp_server = Server("Django-CRM-Bridge")
 
+# Request bodies are read-only once validated; enums are stored as their plain string values
+_REQUEST_MODEL_CONFIG = ConfigDict(extra='ignore', frozen=True, populate_by_name=True, use_enum_values=True)
+
+class TaskType(str, Enum):
+    TODO = 'to-do'
+    EMAIL = 'email'
+    WHATSAPP = 'whatsapp'
+    CALL = 'call'
+
+class TaskPriority(str, Enum):
+    NONE = 'none'
+    LOW = 'low'
+    MEDIUM = 'medium'
+    HIGH = 'high'
+
+class TaskStatus(str, Enum):
+    IN_PROGRESS = 'in_progress'
+    TODO = 'to-do'
+    COMPLETED = 'completed'
+
 class ContactInput(BaseModel):
+    model_config = _REQUEST_MODEL_CONFIG
+
     name: str
     last_name: Optional[str] = None
     email: str
@@ -72,6 +225,8 @@ class ContactInput(BaseModel):
     country: Optional[str] = None
 
 class UpdateContactInput(BaseModel):
+    model_config = _REQUEST_MODEL_CONFIG
+
     name: Optional[str] = None
     last_name: Optional[str] = None
     email: Optional[str] = None
@@ -81,34 +236,108 @@ class UpdateContactInput(BaseModel):
     departments: Optional[str] = None
 
 # --- LOGIC HANDLERS ---
-async def logic_get_contacts(search: str = None, limit: int = 10):
+async def logic_get_contacts(token: Optional[str], search: str = None, limit: int = 10):
     params = {"limit": limit}
     if search: params["search"] = search
-    return await fetch_from_django("contacts/", params=params)
-
-async def logic_create_contact(data: dict):
-    return await fetch_from_django("contacts/", method="POST", body=data)
-
-async def logic_update_status(task_id: int, status: str):
-    return await fetch_from_django(f"tasks/{task_id}/update-status/", method="PATCH", body={"status": status})
-
-async def logic_update_priority(task_id: int, priority: str):
-    return await fetch_from_django(f"tasks/{task_id}/update-priority/", method="PATCH", body={"priority": priority})
-
-async def logic_get_tasks(limit: int = 10, status: str = None):
+    return await cached_fetch(
+        cache_key(token, "contacts/", params), 30, lambda: fetch_from_django(token, "contacts/", params=params)
+    )
+
+async def logic_create_contact(token: Optional[str], data: dict):
+    result = await fetch_from_django(token, "contacts/", method="POST", body=data)
+    invalidate_cache("contacts/")
+    return result
+
+async def logic_update_status(token: Optional[str], task_id: int, status: str):
+    result = await fetch_from_django(token, f"tasks/{task_id}/update-status/", method="PATCH", body={"status": status})
+    invalidate_cache("tasks/")
+    return result
+
+async def logic_update_priority(token: Optional[str], task_id: int, priority: str):
+    result = await fetch_from_django(token, f"tasks/{task_id}/update-priority/", method="PATCH", body={"priority": priority})
+    invalidate_cache("tasks/")
+    return result
+
+@functools.lru_cache(maxsize=64)
+def _build_tasks_params(limit: int, status: Optional[str]) -> httpx.QueryParams:
+    # QueryParams is immutable, so one instance per (limit, status) is safely reused
     params = {"limit": limit}
     if status: params["status"] = status
-    return await fetch_from_django("tasks/", params=params)
-
-async def logic_create_task(title: str, priority: str = "medium"):
-    return await fetch_from_django("tasks/", method="POST", body={"title": title, "priority": priority})
-
-async def logic_get_latest_tasks():
-    return await fetch_from_django("tasks/latest/")
+    return httpx.QueryParams(params)
+
+async def logic_get_tasks(token: Optional[str], limit: int = 10, status: str = None):
+    return await fetch_from_django(token, "tasks/", params=_build_tasks_params(limit, status))
+
+async def logic_create_task(token: Optional[str], title: str, priority: str = "medium"):
+    result = await fetch_from_django(token, "tasks/", method="POST", body={"title": title, "priority": priority})
+    invalidate_cache("tasks/")
+    return result
+
+async def logic_get_latest_tasks(token: Optional[str]):
+    return await cached_fetch(
+        cache_key(token, "tasks/latest/"), 15, lambda: fetch_from_django(token, "tasks/latest/")
+    )
+
+async def logic_get_stats(token: Optional[str]):
+    return await cached_fetch(
+        cache_key(token, "tasks/statistics/"), 60, lambda: fetch_from_django(token, "tasks/statistics/")
+    )
+
+def _dashboard_section(result: Any) -> Any:
+    # gather(return_exceptions=True) can hand back CancelledError too, which isn't an Exception
+    if isinstance(result, BaseException):
+        return {"error": str(result) or type(result).__name__}
+    return result
+
+async def logic_get_dashboard(token: Optional[str]):
+    # Independent reads run concurrently and multiplex over the shared HTTP/2 connection
+    stats, latest, contacts = await asyncio.gather(
+        logic_get_stats(token),
+        logic_get_latest_tasks(token),
+        logic_get_contacts(token, limit=5),
+        return_exceptions=True,
+    )
+    return {
+        "stats": _dashboard_section(stats),
+        "latest_tasks": _dashboard_section(latest),
+        "contacts": _dashboard_section(contacts),
+    }
 
-async def logic_get_stats():
-    return await fetch_from_django("tasks/statistics/")
 
+# --- MCP TOOLS ---
+# Tool objects are built once at import; list_tools hands back the same list every call.
+_TOOLS_CACHE: List[types.Tool] = [
+    types.Tool(name="get_crm_tasks", description="List CRM tasks, optionally filtered by status.", inputSchema=GET_TASKS_SCHEMA),
+    types.Tool(name="create_crm_task", description="Create a new CRM task.", inputSchema=CREATE_TASK_SCHEMA),
+    types.Tool(name="get_latest_tasks", description="Get the most recently created CRM tasks.", inputSchema=EMPTY_SCHEMA),
+    types.Tool(name="get_crm_stats", description="Get task statistics from the CRM.", inputSchema=EMPTY_SCHEMA),
+    types.Tool(name="get_crm_dashboard", description="Get CRM stats, latest tasks and recent contacts in one call.", inputSchema=EMPTY_SCHEMA),
+]
+
+@mcp_server.list_tools()
+async def handle_list_tools() -> List[types.Tool]:
+    return _TOOLS_CACHE
+
+_TOOL_HANDLERS: Dict[str, Callable[[Optional[str], dict], Awaitable[Any]]] = {
+    "get_crm_tasks": lambda t, a: logic_get_tasks(t, limit=a.get("limit", 10), status=a.get("status")),
+    "create_crm_task": lambda t, a: logic_create_task(t, a.get("title"), a.get("priority", "medium")),
+    "get_latest_tasks": lambda t, a: logic_get_latest_tasks(t),
+    "get_crm_stats": lambda t, a: logic_get_stats(t),
+    "get_crm_dashboard": lambda t, a: logic_get_dashboard(t),
+}
+
+def _mcp_request_token() -> Optional[str]:
+    # The SSE transport attaches the POST /messages request, which went through AuthMiddleware
+    request = mcp_server.request_context.request
+    return getattr(request.state, "token", None) if request is not None else None
+
+@mcp_server.call_tool()
+async def handle_call_tool(name: str, arguments: Optional[dict]) -> List[types.TextContent]:
+    handler = _TOOL_HANDLERS.get(name)
+    if not handler:
+        raise ValueError(f"Unknown tool: {name}")
+    result = await handler(_mcp_request_token(), arguments or {})
+    return [types.TextContent(type="text", text=orjson.dumps(result).decode())]
 
 # --- REST ENDPOINTS (For ChatGPT) ---
 @app.get("/")
@@ -116,81 +345,98 @@ async def health_check():
     return {"status": "ok", "message": "Django MCP Bridge is running!"}
 
 @app.get("/tasks/all")
-async def api_get_tasks(limit: int = 10, status: Optional[str] = None):
-    return await logic_get_tasks(limit, status)
+async def api_get_tasks(request: Request, limit: int = 10, status: Optional[str] = None):
+    return await logic_get_tasks(request.state.token, limit, status)
 
 # [ADDED] Endpoint for Latest Tasks
 @app.get("/tasks/latest")
-async def api_get_latest_tasks():
-    return await logic_get_latest_tasks()
+async def api_get_latest_tasks(request: Request):
+    return await logic_get_latest_tasks(request.state.token)
 
 # [ADDED] Endpoint for Stats
 @app.get("/stats")
-async def api_get_stats():
-    return await logic_get_stats()
+async def api_get_stats(request: Request):
+    return await logic_get_stats(request.state.token)
+
+@app.get("/dashboard", operation_id="getDashboard")
+async def api_get_dashboard(request: Request):
+    """CRM overview: stats, latest tasks and the first few contacts, fetched concurrently."""
+    return await logic_get_dashboard(request.state.token)
 
 @app.patch("/tasks/{task_id}/update-status", operation_id="updateTaskStatus")
-async def api_update_status(task_id: int, data: Dict[str, str]):
+async def api_update_status(request: Request, task_id: int, data: Dict[str, str]):
     new_status = data.get("status")
     if not new_status:
         return {"error": "Missing status field"}
-    return await logic_update_status(task_id, new_status)
+    return await logic_update_status(request.state.token, task_id, new_status)
 
 @app.patch("/tasks/{task_id}/update-priority", operation_id="updateTaskPriority")
-async def api_update_priority(task_id: int, data: Dict[str, str]):
+async def api_update_priority(request: Request, task_id: int, data: Dict[str, str]):
     new_priority = data.get("priority")
     if not new_priority:
         return {"error": "Missing priority field"}
-    return await logic_update_priority(task_id, new_priority)
+    return await logic_update_priority(request.state.token, task_id, new_priority)
 
 class CreateTaskModel(BaseModel):
+    model_config = _REQUEST_MODEL_CONFIG
+
     title: str
     priority: Optional[str] = "medium"
 
 @app.post("/tasks/create")
-async def api_create_task(task: CreateTaskModel):
-    return await logic_create_task(task.title, task.priority)
+async def api_create_task(request: Request, task: CreateTaskModel):
+    return await logic_create_task(request.state.token, task.title, task.priority)
 
 class UpdateTaskInput(BaseModel):
+    model_config = _REQUEST_MODEL_CONFIG
+
     title: Optional[str] = Field(None)
-    task_type: Optional[Literal['to-do', 'email', 'whatsapp', 'call']] = Field(None)
-    priority: Optional[Literal['none', 'low', 'medium', 'high']] = Field(None)
-    status: Optional[Literal['in_progress', 'to-do', 'completed']] = Field(None)
+    task_type: Optional[TaskType] = Field(None)
+    priority: Optional[TaskPriority] = Field(None)
+    status: Optional[TaskStatus] = Field(None)
     due_date: Optional[str] = Field(None)
     notes: Optional[str] = Field(None)
 
 @app.patch("/tasks/{task_id}", operation_id="updateTask")
-async def gpt_update_task(task_id: int, task: UpdateTaskInput):
-    payload = task.model_dump(exclude_none=True)
+async def gpt_update_task(request: Request, task_id: int, task: UpdateTaskInput):
+    payload = task.model_dump(exclude_none=True, mode='python')
     if not payload:
         return {"error": "No fields provided to update."}
-    return await fetch_from_django(f"tasks/{task_id}/", method="PATCH", body=payload)
+    result = await fetch_from_django(request.state.token, f"tasks/{task_id}/", method="PATCH", body=payload)
+    invalidate_cache("tasks/")
+    return result
 
 @app.get("/contacts/search", operation_id="searchContacts")
-async def api_search_contacts(search: Optional[str] = None, limit: int = 10):
+async def api_search_contacts(request: Request, search: Optional[str] = None, limit: int = 10):
     """Search for contacts by name, email, or title."""
-    return await logic_get_contacts(search, limit)
+    return await logic_get_contacts(request.state.token, search, limit)
 
 @app.post("/contacts/create", operation_id="createContact")
-async def api_create_contact(contact: ContactInput):
+async def api_create_contact(request: Request, contact: ContactInput):
     """Create a new contact in the CRM."""
-    return await logic_create_contact(contact.model_dump(exclude_none=True))
+    return await logic_create_contact(request.state.token, contact.model_dump(exclude_none=True, mode='python'))
 
 @app.patch("/contacts/{contact_id}", operation_id="updateContact")
-async def api_update_contact(contact_id: int, contact: UpdateContactInput):
+async def api_update_contact(request: Request, contact_id: int, contact: UpdateContactInput):
     """Update specific fields of an existing contact."""
-    payload = contact.model_dump(exclude_none=True)
+    payload = contact.model_dump(exclude_none=True, mode='python')
     if not payload:
         return {"error": "No fields provided to update."}
-    return await fetch_from_django(f"contacts/{contact_id}/", method="PATCH", body=payload)
+    result = await fetch_from_django(request.state.token, f"contacts/{contact_id}/", method="PATCH", body=payload)
+    invalidate_cache("contacts/")
+    return result
 
 @app.delete("/contacts/{contact_id}", operation_id="deleteContact")
-async def api_delete_contact(contact_id: int):
+async def api_delete_contact(request: Request, contact_id: int):
     """Delete a contact from the CRM."""
-    return await fetch_from_django(f"contacts/{contact_id}/", method="DELETE")
+    result = await fetch_from_django(request.state.token, f"contacts/{contact_id}/", method="DELETE")
+    invalidate_cache("contacts/")
+    return result
 
 # --- Pydantic Model for Email ---
 class SendEmailInput(BaseModel):
+    model_config = _REQUEST_MODEL_CONFIG
+
     to: str = Field(..., description="Recipient email address")
     subject: str = Field(..., description="Subject line of the email")
     body: str = Field(..., description="Body of the email (supports HTML)")
@@ -201,19 +447,21 @@ class SendEmailInput(BaseModel):
 # --- Email Endpoint ---
 # We use the specific "gamil" path as required by your folder structure
 @app.post("/gamil/send_mail/", operation_id="sendEmail")
-async def api_send_email(email_data: SendEmailInput):
+async def api_send_email(request: Request, email_data: SendEmailInput):
     """
     Sends an email using the user's connected Gmail account in the CRM.
     """
     # Convert Pydantic model to a dict, handling the 'from' alias
-    payload = email_data.model_dump(by_alias=True, exclude_none=True)
+    payload = email_data.model_dump(by_alias=True, exclude_none=True, mode='python')
     
     # CRITICAL FIX: Match the "gamil/send_mail/" path exactly as defined in your Django urls.py
     # We add the trailing slash here to avoid 301 redirect issues with POST data
-    return await fetch_from_django("gamil/send_mail/", method="POST", body=payload)
+    return await fetch_from_django(request.state.token, "gamil/send_mail/", method="POST", body=payload)
 
 # --- Pydantic Model for WhatsApp ---
 class SendWhatsAppInput(BaseModel):
+    model_config = _REQUEST_MODEL_CONFIG
+
     phone: str = Field(..., description="Recipient phone number (e.g., +919123456789)")
     message: Optional[str] = Field(None, description="The text message content")
     contact_id: Optional[int] = Field(None, description="The CRM ID of the contact")
@@ -223,26 +471,28 @@ class SendWhatsAppInput(BaseModel):
 # --- WhatsApp Endpoints ---
 
 @app.post("/whatsapp/send", operation_id="sendWhatsApp")
-async def api_send_whatsapp(wa_data: SendWhatsAppInput):
+async def api_send_whatsapp(request: Request, wa_data: SendWhatsAppInput):
     """
     Sends a WhatsApp message to a contact or phone number via the CRM.
     """
-    payload = wa_data.model_dump(exclude_none=True)
+    payload = wa_data.model_dump(exclude_none=True, mode='python')
     # Forward to Django path: "whatsapp/send/" (Verify this name in your Django urls.py)
-    return await fetch_from_django("whatsapp/send/", method="POST", body=payload)
+    return await fetch_from_django(request.state.token, "whatsapp/send/", method="POST", body=payload)
 
 @app.get("/contacts/{contact_id}/messages", operation_id="getWhatsAppMessages")
-async def api_get_wa_messages(contact_id: int):
+async def api_get_wa_messages(request: Request, contact_id: int):
     """
     Retrieves the history of WhatsApp messages for a specific contact.
     """
-    return await fetch_from_django(f"contacts/{contact_id}/messages/", method="GET")
+    return await fetch_from_django(request.state.token, f"contacts/{contact_id}/messages/", method="GET")
 
 # --- Pydantic Models for Meetings ---
 class MeetingAttendee(BaseModel):
     email: str
 
 class CreateMeetingInput(BaseModel):
+    model_config = _REQUEST_MODEL_CONFIG
+
     event_title: str = Field(..., description="The title of the meeting")
     description: Optional[str] = None
     location: Optional[str] = None
@@ -256,11 +506,11 @@ class CreateMeetingInput(BaseModel):
 # --- Meeting Endpoints ---
 
 @app.get("/meetings/all", operation_id="getAllMeetings")
-async def api_get_meetings(limit: int = 10, status: Optional[str] = None):
+async def api_get_meetings(request: Request, limit: int = 10, status: Optional[str] = None):
     """List scheduled meetings."""
     params = {"limit": limit}
     if status: params["status"] = status
-    return await fetch_from_django("meetings/", params=params)
+    return await fetch_from_django(request.state.token, "meetings/", params=params)
 
 def prepare_meeting_payload(data: CreateMeetingInput):
     # Use dateutil to handle 'Z' or offset formats gracefully
@@ -291,44 +541,46 @@ def prepare_meeting_payload(data: CreateMeetingInput):
 
 # --- Updated FastAPI Endpoint ---
 @app.post("/meetings/create", operation_id="createMeeting")
-async def api_create_meeting(meeting: CreateMeetingInput):
+async def api_create_meeting(request: Request, meeting: CreateMeetingInput):
     try:
         # 1. Transform simple GPT data into complex CRM payload
         crm_payload = prepare_meeting_payload(meeting)
         
         # 2. Forward to Django (ensure trailing slash exists)
         # Your ViewSet uses standard router paths, so "meetings/" is correct
-        return await fetch_from_django("meetings/", method="POST", body=crm_payload)
+        return await fetch_from_django(request.state.token, "meetings/", method="POST", body=crm_payload)
     except Exception as e:
         # Return error as JSON instead of letting FastAPI 500
         return {"error": f"Bridge processing failed: {str(e)}"}
 
 @app.delete("/meetings/{meeting_id}", operation_id="deleteMeeting")
-async def api_delete_meeting(meeting_id: int):
+async def api_delete_meeting(request: Request, meeting_id: int):
     """Cancels a meeting and removes it from Google Calendar."""
-    return await fetch_from_django(f"meetings/{meeting_id}/", method="DELETE")
+    return await fetch_from_django(request.state.token, f"meetings/{meeting_id}/", method="DELETE")
 
 class WhatsAppTemplateSendInput(BaseModel):
+    model_config = _REQUEST_MODEL_CONFIG
+
     phone: str = Field(..., description="Recipient phone number (e.g. 7908821522)")
     template_id: int = Field(..., description="The database ID of the template")
     message: Optional[str] = Field("Hello", description="The text content for the message")
     contact_id: Optional[int] = None
 
 # --- Logic Handlers ---
-async def logic_get_whatsapp_templates():
+async def logic_get_whatsapp_templates(token: Optional[str]):
     # Filters by WHATSAPP type via Django filterset_fields
     params = {"template_type": "WHATSAPP", "template_status": "APPROVED"}
-    return await fetch_from_django("templates/", params=params)
+    return await fetch_from_django(token, "templates/", params=params)
 
 # --- REST Endpoints ---
 
 @app.get("/whatsapp/templates", operation_id="listWhatsAppTemplates")
-async def api_list_templates():
+async def api_list_templates(request: Request):
     """Retrieves all approved WhatsApp message templates from the CRM."""
-    return await logic_get_whatsapp_templates()
+    return await logic_get_whatsapp_templates(request.state.token)
 
 @app.post("/whatsapp/send-template", operation_id="sendWhatsAppTemplate")
-async def api_send_whatsapp_template(data: WhatsAppTemplateSendInput):
+async def api_send_whatsapp_template(request: Request, data: WhatsAppTemplateSendInput):
     """
     Sends a WhatsApp Template using the structure expected by Django.
     """
@@ -342,7 +594,7 @@ async def api_send_whatsapp_template(data: WhatsAppTemplateSendInput):
     }
     
     # Ensure your Django URL is correctly mapped (likely "whatsapp/send/")
-    return await fetch_from_django("whatsapp/send/", method="POST", body=payload)
+    return await fetch_from_django(request.state.token, "whatsapp/send/", method="POST", body=payload)
 
 # --- MCP SSE Transport ---
 sse = SseServerTransport("/messages")
@@ -357,4 +609,12 @@ async def handle_messages(request: Request):
     await sse.handle_post_message(request.scope, request.receive, request._send)
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=PORT)
\ No newline at end of file
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=PORT,
+        loop="uvloop",
+        http="httptools",
+        workers=WEB_CONCURRENCY,
+        log_level="warning",
+    )
\ No newline at end of file
@@ -1,29 +1,49 @@
-import httpx
+import base64
+import hashlib
+import hmac
+import html
+import struct
+import time
 from fastapi import APIRouter, Request, Form, HTTPException, Query
 from fastapi.responses import HTMLResponse, RedirectResponse
 from typing import Optional
-from itsdangerous import URLSafeTimedSerializer
 from settings import DJANGO_LOGIN_URL, MCP_SECRET_KEY
 
-serializer = URLSafeTimedSerializer(MCP_SECRET_KEY)
 router = APIRouter()
 
-@router.get("/authorize", response_class=HTMLResponse)
-async def authorize_page(
-    redirect_uri: Optional[str] = Query(None),
-    state: Optional[str] = Query(None),
-):
-    if not redirect_uri:
-        return HTMLResponse("<h2>Missing redirect_uri. Start from ChatGPT.</h2>", status_code=400)
+# --- Authorization Codes ---
+# A code is base64url(timestamp | truncated HMAC-SHA256 | token), valid for CODE_MAX_AGE seconds.
+_CODE_KEY = MCP_SECRET_KEY.encode()
+_MAC_SIZE = 16
+CODE_MAX_AGE = 300
+
+def seal(token: str) -> str:
+    ts = struct.pack(">I", int(time.time()))
+    raw = token.encode()
+    mac = hmac.new(_CODE_KEY, ts + raw, hashlib.sha256).digest()[:_MAC_SIZE]
+    return base64.urlsafe_b64encode(ts + mac + raw).rstrip(b"=").decode()
+
+def unseal(code: str, max_age: int = CODE_MAX_AGE) -> str:
+    data = base64.urlsafe_b64decode(code + "=" * (-len(code) % 4))
+    ts, mac, raw = data[:4], data[4:4 + _MAC_SIZE], data[4 + _MAC_SIZE:]
+    expected = hmac.new(_CODE_KEY, ts + raw, hashlib.sha256).digest()[:_MAC_SIZE]
+    if not raw or not hmac.compare_digest(mac, expected):
+        raise ValueError("Invalid code signature")
+    if time.time() - struct.unpack(">I", ts)[0] > max_age:
+        raise ValueError("Code expired")
+    return raw.decode()
 
-    return f"""
+# Static parts of the login page, encoded once; only the escaped query values are spliced in per request
+_AUTHORIZE_PREFIX = b'''
     <html>
     <body style="font-family: sans-serif; display: flex; justify-content: center; align-items: center; height: 100vh; background: #f4f4f5;">
         <div style="background: white; padding: 2rem; border-radius: 12px; box-shadow: 0 4px 6px rgba(0,0,0,0.1); width: 300px;">
             <h2 style="text-align: center; color: #333;">CRM Login</h2>
             <form action="/oauth/login" method="post">
-                <input type="hidden" name="redirect_uri" value="{redirect_uri}">
-                <input type="hidden" name="state" value="{state or ''}">
+                <input type="hidden" name="redirect_uri" value="'''
+_AUTHORIZE_MIDDLE = b'''">
+                <input type="hidden" name="state" value="'''
+_AUTHORIZE_SUFFIX = b'''">
                 <input type="email" name="email" placeholder="Email" required style="width: 100%; padding: 10px; margin-bottom: 10px; border: 1px solid #ddd; border-radius: 4px;">
                 <input type="password" name="password" placeholder="Password" required style="width: 100%; padding: 10px; margin-bottom: 20px; border: 1px solid #ddd; border-radius: 4px;">
                 <button type="submit" style="width: 100%; padding: 10px; background: #2563eb; color: white; border: none; border-radius: 4px; cursor: pointer;">Sign In</button>
@@ -31,46 +51,62 @@ async def authorize_page(
         </div>
     </body>
     </html>
-    """
+    '''
+
+@router.get("/authorize", response_class=HTMLResponse)
+async def authorize_page(
+    redirect_uri: Optional[str] = Query(None),
+    state: Optional[str] = Query(None),
+):
+    if not redirect_uri:
+        return HTMLResponse("<h2>Missing redirect_uri. Start from ChatGPT.</h2>", status_code=400)
+
+    return HTMLResponse(
+        _AUTHORIZE_PREFIX
+        + html.escape(redirect_uri).encode()
+        + _AUTHORIZE_MIDDLE
+        + html.escape(state or "").encode()
+        + _AUTHORIZE_SUFFIX
+    )
 
 @router.post("/login")
 async def login_and_authorize(
+    request: Request,
     email: str = Form(...),      
     password: str = Form(...),
     redirect_uri: str = Form(...),
     state: str = Form(...)
 ):
-    async with httpx.AsyncClient() as client:
-        try:
-            # Try JSON login first (standard for DRF)
-            payload = {"email": email, "password": password}
-            response = await client.post(DJANGO_LOGIN_URL, json=payload, timeout=10.0)
-            
-            if response.status_code != 200:
-                return HTMLResponse(f"<h3>Login Failed: {response.text}</h3>", status_code=401)
-                
-            data = response.json()
-            # Support various token keys (DRF uses 'access', generic uses 'token')
-            django_token = data.get("access") or data.get("token") or data.get("key")
+    try:
+        # Try JSON login first (standard for DRF)
+        payload = {"email": email, "password": password}
+        response = await request.app.state.http.post(DJANGO_LOGIN_URL, json=payload)
+        
+        if response.status_code != 200:
+            return HTMLResponse(f"<h3>Login Failed: {response.text}</h3>", status_code=401)
             
-            if not django_token:
-                return HTMLResponse("<h3>Error: No token returned from backend.</h3>", status_code=400)
+        data = response.json()
+        # Support various token keys (DRF uses 'access', generic uses 'token')
+        django_token = data.get("access") or data.get("token") or data.get("key")
+        
+        if not django_token:
+            return HTMLResponse("<h3>Error: No token returned from backend.</h3>", status_code=400)
 
-            # Encrypt the Django token into a temporary code
-            auth_code = serializer.dumps(django_token)
-            
-            separator = "&" if "?" in redirect_uri else "?"
-            final_url = f"{redirect_uri}{separator}code={auth_code}&state={state}"
-            return RedirectResponse(url=final_url, status_code=303)
+        # Encrypt the Django token into a temporary code
+        auth_code = seal(django_token)
+        
+        separator = "&" if "?" in redirect_uri else "?"
+        final_url = f"{redirect_uri}{separator}code={auth_code}&state={state}"
+        return RedirectResponse(url=final_url, status_code=303)
 
-        except Exception as e:
-            return HTMLResponse(f"<h3>System Error: {str(e)}</h3>", status_code=500)
+    except Exception as e:
+        return HTMLResponse(f"<h3>System Error: {str(e)}</h3>", status_code=500)
 
 @router.post("/token")
 async def exchange_token(code: str = Form(...)):
     try:
         # Decrypt the code to get back the real Django token
-        django_token = serializer.loads(code, max_age=300) # Code valid for 5 mins
+        django_token = unseal(code) # Code valid for 5 mins
         return {
             "access_token": django_token,
             "token_type": "Bearer",
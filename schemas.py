@@ -0,0 +1,23 @@
+# --- MCP Tool Input Schemas ---
+# Plain, mutable source constants for the Tool objects in main.py. pydantic copies each one into
+# its Tool's inputSchema when the tool list is built at import, so Tools don't share these dicts.
+# Keep them JSON-Schema shaped (lists, not tuples): mcp validates tool arguments against them.
+
+GET_TASKS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "limit": {"type": "integer", "default": 10},
+        "status": {"type": "string", "enum": ["to-do", "in_progress", "completed"]},
+    },
+}
+
+CREATE_TASK_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string"},
+        "priority": {"type": "string", "enum": ["none", "low", "medium", "high"], "default": "medium"},
+    },
+    "required": ["title"],
+}
+
+EMPTY_SCHEMA = {"type": "object", "properties": {}}
@@ -6,11 +6,18 @@ load_dotenv()
 # --- Server Config ---
 PORT = int(os.getenv("PORT", 8005))
 ENVIRONMENT = os.getenv("ENVIRONMENT", "local")  # 'local' or 'production'
+# Number of uvicorn worker processes (same default as uvicorn itself). Each worker holds its own
+# app, HTTP pool, response cache and in-flight table; none of these are shared between workers.
+# MCP SSE sessions live in the worker that opened /sse, so more than 1 worker needs sticky
+# sessions in front of the app or POST /messages will hit "Could not find session".
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", 1))
 
 # --- Django Backend Configuration ---
 # CRITICAL: On Render, this cannot be localhost. It must be the public URL of your Django API.
 DJANGO_BASE_URL = os.getenv("DJANGO_BASE_URL", "https://salesapi.gravityer.com/api/v1")
-DJANGO_LOGIN_URL = DJANGO_BASE_URL.rstrip("/") + "/token/obtain/"
+# Normalized once so the shared httpx client can join relative endpoints onto it
+DJANGO_BASE_URL_NORMALIZED = DJANGO_BASE_URL.rstrip("/") + "/"
+DJANGO_LOGIN_URL = DJANGO_BASE_URL_NORMALIZED + "token/obtain/"
 
 # --- Security ---
 # This key acts as the bridge's private key to sign OAuth codes.